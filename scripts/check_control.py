@@ -1,17 +1,38 @@
 #!/usr/bin/env python3
 import serial
+import selectors
+import re
 import time
 import sys
+import os
 import threading
+import multiprocessing
 
 # ================= CONFIG =================
 SERIAL_PORT = '/dev/ttyUSB0'
 BAUDRATE    = 115200
+RENDER_FPS  = 30     # display refresh cap; telemetry can arrive much faster
+BACKLOG_DROP_BYTES = 512  # RX backlog beyond which ODO lines are dropped
+
+DEBUG = False  # Set to True to echo every sent twist frame
+
+# auto_cycle only ever sends a handful of fixed (lin, ang) pairs, so
+# memoize each encoded frame once instead of re-formatting and
+# re-allocating on every heartbeat.
+_FRAME_CACHE = {}
 
 def send_twist(ser, lin, ang):
-    frame = f'<V,{lin:.2f},{ang:.2f}>\n'
-    ser.write(frame.encode())
-    print(f"  → SENT: {frame.strip()}")
+    frame = _FRAME_CACHE.get((lin, ang))
+    if frame is None:
+        # bytes %-formatting builds the ASCII frame directly, skipping
+        # the str build + UTF-8 encode roundtrip.
+        frame = b'<V,%.2f,%.2f>\n' % (lin, ang)
+        _FRAME_CACHE[(lin, ang)] = frame
+    ser.write(frame)
+    # Echoing every heartbeat costs far more than the serial write itself
+    # (stdout syscall + a table redraw in the reader), so keep it opt-in.
+    if DEBUG:
+        print(f"  → SENT: {frame.decode().strip()}")
 
 def wait_secs(seconds):
     for i in range(int(seconds), 0, -1):
@@ -21,11 +42,6 @@ def wait_secs(seconds):
     sys.stdout.write("\r    …continuing now   \n")
     sys.stdout.flush()
 
-import re
-import os
-import sys
-import time
-
 # Terminal colors
 RESET = "\033[0m"
 CYAN = "\033[36m"
@@ -38,124 +54,260 @@ ODO = None
 STATE = None
 LAST_CMD = None
 LAST_MSG = None
+_DIRTY = False
+
+# Preallocated telemetry records: the parsers mutate these in place at
+# frame rate instead of building a fresh dict per line. ODO/STATE stay
+# None until the first frame so the render's presence checks still work.
+_ODO_REC = {"lin": 0.0, "ang": 0.0, "theta": 0.0, "dlin": 0.0, "dang": 0.0}
+_STATE_REC = {"ts": 0, "fl": 0, "fr": 0, "rl": 0, "rr": 0,
+              "flv": 0.0, "frv": 0.0, "rlv": 0.0, "rrv": 0.0,
+              "lin": 0.0, "ang": 0.0, "theta": 0.0, "dlin": 0.0, "dang": 0.0}
+
+# Compiled once at import — re.match on a literal pattern re-does a cache
+# lookup on every received line, which adds up on the RX hot path.
+_ODO_RE = re.compile(r"<O,([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+)>")
+_STATE_RE = re.compile(r"<S,([\d\.]+),([-\d]+),([-\d]+),([-\d]+),([-\d]+),([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+)>")
+
+# Diff renderer: re-printing the whole table with a '\033c' reset on
+# every telemetry line flickers and burns CPU. Keep the last rendered
+# lines and only rewrite the ones that changed, in a single stdout write.
+_LAST_LINES = None
+
+def _move(row):
+    return f"\x1b[{row};1H"
+
+def _render(lines):
+    global _LAST_LINES
+    out = []
+    if _LAST_LINES is None:
+        if sys.stdout.isatty():
+            out.append("\x1b[2J")
+        out.append(_move(1))
+        out.append("\x1b[K\n".join(lines))
+        out.append("\n")
+    else:
+        for i, text in enumerate(lines):
+            if i >= len(_LAST_LINES) or _LAST_LINES[i] != text:
+                out.append(_move(i + 1) + "\x1b[K" + text)
+        # Blank any leftover rows from a taller previous frame
+        for i in range(len(lines), len(_LAST_LINES)):
+            out.append(_move(i + 1) + "\x1b[K")
+        out.append(_move(len(lines) + 1))
+    _LAST_LINES = lines
+    if out:
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
 
-def clear_screen():
-    # Only on real terminals
-    if sys.stdout.isatty():
-        print("\033c", end='')
+# Each section as one precomputed %-template: a single C-level
+# interpolation per frame instead of parsing an f-string per row.
+_ODO_TPL = (CYAN + "Odometry:" + RESET + "\n"
+            "  ẋ:   %.3f m/s\n"
+            "  θ̇:   %.3f rad/s\n"
+            "  θ:    %.3f°\n"
+            "  Δx:   %.3f\n"
+            "  Δθ:   %.3f")
+_STATE_TPL = ("\n" + MAGENTA + "State:" + RESET + "\n"
+              "  t:    %d\n"
+              "  FL:   %d    FR: %d\n"
+              "  RL:   %d    RR: %d\n"
+              "  lin:  %.3f   ang: %.3f\n"
+              "  θ:    %.3f  Δx: %.3f  Δθ: %.3f")
 
 def print_table():
-    clear_screen()
-    print(f"{BOLD}==== ROBOT TELEMETRY ===={RESET}")
+    lines = [f"{BOLD}==== ROBOT TELEMETRY ===={RESET}"]
     if ODO:
-        print(f"{CYAN}Odometry:{RESET}")
-        print(f"  ẋ:   {ODO['lin']:.3f} m/s")
-        print(f"  θ̇:   {ODO['ang']:.3f} rad/s")
-        print(f"  θ:    {ODO['theta']:.3f}°")
-        print(f"  Δx:   {ODO['dlin']:.3f}")
-        print(f"  Δθ:   {ODO['dang']:.3f}")
+        lines += (_ODO_TPL % (ODO['lin'], ODO['ang'], ODO['theta'],
+                              ODO['dlin'], ODO['dang'])).split('\n')
     else:
-        print(f"{CYAN}Odometry: ...{RESET}")
+        lines.append(f"{CYAN}Odometry: ...{RESET}")
 
     if STATE:
-        print(f"\n{MAGENTA}State:{RESET}")
-        print(f"  t:    {STATE['ts']}")
-        print(f"  FL:   {STATE['fl']}    FR: {STATE['fr']}")
-        print(f"  RL:   {STATE['rl']}    RR: {STATE['rr']}")
-        print(f"  lin:  {STATE['lin']:.3f}   ang: {STATE['ang']:.3f}")
-        print(f"  θ:    {STATE['theta']:.3f}  Δx: {STATE['dlin']:.3f}  Δθ: {STATE['dang']:.3f}")
+        lines += (_STATE_TPL % (STATE['ts'], STATE['fl'], STATE['fr'],
+                                STATE['rl'], STATE['rr'], STATE['lin'],
+                                STATE['ang'], STATE['theta'],
+                                STATE['dlin'], STATE['dang'])).split('\n')
     else:
-        print(f"{MAGENTA}State: ...{RESET}")
+        lines.append(f"{MAGENTA}State: ...{RESET}")
 
     if LAST_CMD:
-        print(f"\n{GREEN}Last Command:{RESET} {LAST_CMD}")
+        lines.append("")
+        lines.append(f"{GREEN}Last Command:{RESET} {LAST_CMD}")
     if LAST_MSG:
-        print(f"\n{YELLOW}Other:{RESET} {LAST_MSG}")
+        lines.append("")
+        lines.append(f"{YELLOW}Other:{RESET} {LAST_MSG}")
+    _render(lines)
+
+def _to_int(s):
+    # The MCU sends counters/timestamps without a decimal point, so a
+    # direct int() (one C-level parse) covers the normal case; the
+    # str -> float -> int round-trip is only a fallback.
+    return int(s) if '.' not in s else int(float(s))
+
+def _parse_state_fields(f):
+    # Hot tokenizer for the 14-field STATE frame, kept as a standalone
+    # function so a compiled (Cython/Numba) parser could drop in behind
+    # the same signature. map(float, ...) converts the float fields in
+    # one C-level pass, and all conversions finish before the shared
+    # record is touched so a bad field can't leave it half-updated.
+    v = list(map(float, f[5:]))
+    ts, fl, fr, rl, rr = (_to_int(f[0]), _to_int(f[1]), _to_int(f[2]),
+                          _to_int(f[3]), _to_int(f[4]))
+    rec = _STATE_REC
+    rec["ts"] = ts
+    rec["fl"] = fl
+    rec["fr"] = fr
+    rec["rl"] = rl
+    rec["rr"] = rr
+    rec["flv"], rec["frv"], rec["rlv"], rec["rrv"] = v[0], v[1], v[2], v[3]
+    rec["lin"], rec["ang"], rec["theta"] = v[4], v[5], v[6]
+    rec["dlin"], rec["dang"] = v[7], v[8]
+    return rec
 
 def print_pretty(line):
-    global ODO, STATE, LAST_CMD, LAST_MSG
-
-    # ODO
-    m = re.match(r"<O,([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+)>", line)
-    if m:
-        ODO = {
-            "lin": float(m.group(1)),
-            "ang": float(m.group(2)),
-            "theta": float(m.group(3)),
-            "dlin": float(m.group(4)),
-            "dang": float(m.group(5)),
-        }
-        print_table()
-        return
+    global ODO, STATE, LAST_CMD, LAST_MSG, _DIRTY
+
+    # ODO — split is far cheaper than the regex on the hot RX path
+    # (same approach as teleop.parse_robot_feedback); regex stays as a
+    # fallback for malformed frames.
+    if line.startswith('<O,'):
+        if line.endswith('>'):
+            f = line[3:-1].split(',')
+            if len(f) == 5:
+                try:
+                    v = list(map(float, f))
+                    rec = _ODO_REC
+                    rec["lin"], rec["ang"], rec["theta"] = v[0], v[1], v[2]
+                    rec["dlin"], rec["dang"] = v[3], v[4]
+                    ODO = rec
+                    _DIRTY = True
+                    return
+                except ValueError:
+                    pass
+        m = _ODO_RE.match(line)
+        if m:
+            try:
+                v = list(map(float, m.groups()))
+            except ValueError:
+                return
+            rec = _ODO_REC
+            rec["lin"], rec["ang"], rec["theta"] = v[0], v[1], v[2]
+            rec["dlin"], rec["dang"] = v[3], v[4]
+            ODO = rec
+            _DIRTY = True
+            return
 
     # STATE
-    m = re.match(r"<S,([\d\.]+),([-\d]+),([-\d]+),([-\d]+),([-\d]+),([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+),([-\d\.]+)>", line)
-    if m:
-        STATE = {
-            "ts": int(float(m.group(1))),
-            "fl": int(float(m.group(2))),
-            "fr": int(float(m.group(3))),
-            "rl": int(float(m.group(4))),
-            "rr": int(float(m.group(5))),
-            "flv": float(m.group(6)),
-            "frv": float(m.group(7)),
-            "rlv": float(m.group(8)),
-            "rrv": float(m.group(9)),
-            "lin": float(m.group(10)),
-            "ang": float(m.group(11)),
-            "theta": float(m.group(12)),
-            "dlin": float(m.group(13)),
-            "dang": float(m.group(14)),
-        }
-        print_table()
-        return
+    if line.startswith('<S,'):
+        if line.endswith('>'):
+            f = line[3:-1].split(',')
+            if len(f) == 14:
+                try:
+                    STATE = _parse_state_fields(f)
+                    _DIRTY = True
+                    return
+                except ValueError:
+                    pass
+        m = _STATE_RE.match(line)
+        if m:
+            try:
+                STATE = _parse_state_fields(m.groups())
+            except ValueError:
+                return
+            _DIRTY = True
+            return
 
     # Command feedbacks
     if "Set linear" in line or "[CMD OK]" in line:
         LAST_CMD = line
-        print_table()
+        _DIRTY = True
         return
     if "[CMD REJECT]" in line or "Unrecognized command" in line:
         LAST_CMD = line
-        print_table()
-        return
-
-    # Sent commands or other
-    if "→ SENT" in line:
-        LAST_MSG = line
-        print_table()
+        _DIRTY = True
         return
 
     # Any other message
     if line.strip():
         LAST_MSG = line
-        print_table()
+        _DIRTY = True
 
-def reader_thread(ser, running):
-    while running[0]:
+def reader_thread(ser, stop):
+    # Block in the kernel until the fd is readable, then drain everything
+    # the driver has buffered in one raw os.read — no pyserial timeout
+    # polling and no byte-at-a-time '\n' scanning.
+    sel = selectors.DefaultSelector()
+    sel.register(ser, selectors.EVENT_READ)
+    buf = bytearray()
+    while not stop.is_set():
         try:
-            line = ser.readline()
-            if line:
-                try:
-                    decoded = line.decode(errors='replace').strip()
-                except Exception:
-                    decoded = repr(line)
-                print_pretty(decoded)
+            if not sel.select(timeout=0.5):
+                continue
+            try:
+                chunk = os.read(ser.fileno(), 4096)
+            except BlockingIOError:
+                continue
+            if chunk:
+                buf += chunk
+                # Drop-frame policy: the display only ever shows the
+                # latest values, so when the MCU outpaces us shed the
+                # lower-value ODO lines and keep up with STATE instead of
+                # falling arbitrarily far behind.
+                behind = ser.in_waiting > BACKLOG_DROP_BYTES
+                while b'\n' in buf:
+                    raw, _, buf = buf.partition(b'\n')
+                    try:
+                        decoded = raw.decode(errors='replace').strip()
+                    except Exception:
+                        decoded = repr(bytes(raw))
+                    if behind and decoded.startswith('<O,'):
+                        continue
+                    if decoded:
+                        print_pretty(decoded)
         except Exception as e:
             print(f"Reader error: {e}")
             break
 
+def render_thread(stop):
+    # Draw at a fixed cap instead of once per received line: the reader
+    # only marks state dirty, so a fast-talking MCU can't make terminal
+    # I/O the bottleneck.
+    global _DIRTY
+    period = 1.0 / RENDER_FPS
+    while not stop.wait(period):
+        if _DIRTY:
+            _DIRTY = False
+            print_table()
+
+def reader_process(ser):
+    # Entry point for the RX side when run as its own process: parsing
+    # and terminal rendering stay out of the sender's GIL entirely. The
+    # child inherits the serial fd on fork, owns all telemetry state, and
+    # runs until the parent tears it down.
+    stop = threading.Event()
+    ui = threading.Thread(target=render_thread, args=(stop,), daemon=True)
+    ui.start()
+    reader_thread(ser, stop)
 
 
-def wait_and_heartbeat(ser, lin, ang, seconds):
-    # Repeatedly send twist every 100ms
-    end_time = time.time() + seconds
-    while time.time() < end_time:
+def wait_and_heartbeat(ser, lin, ang, seconds, period=0.1):
+    # Repeatedly send twist every `period` seconds. The deadline advances
+    # by the period and we sleep only the remainder, so send overhead
+    # doesn't accumulate as cadence drift; if an iteration overruns, the
+    # missed tick is dropped rather than replayed.
+    deadline = time.perf_counter()
+    end_time = deadline + seconds
+    while deadline < end_time:
         send_twist(ser, lin, ang)
-        time.sleep(0.1)
+        deadline += period
+        dt = deadline - time.perf_counter()
+        if dt > 0:
+            time.sleep(dt)
+        else:
+            deadline = time.perf_counter()
 
-def auto_cycle(ser, running):
-    while running[0]:
+def auto_cycle(ser, stop):
+    while not stop.is_set():
         # 1. Forward
         print("\n→ Auto: Drive straight at 0.30 m/s")
         wait_and_heartbeat(ser, 0.80, 0.00, 5)
@@ -174,25 +326,34 @@ def auto_cycle(ser, running):
 
 def main():
     try:
-        ser = serial.Serial(SERIAL_PORT, BAUDRATE, timeout=0.1)
+        # Non-blocking: the reader waits on the fd itself, so no pyserial
+        # read timeout is needed.
+        ser = serial.Serial(SERIAL_PORT, BAUDRATE, timeout=0)
     except Exception as e:
         print(f"ERROR: Could not open {SERIAL_PORT} at {BAUDRATE} baud: {e}")
         sys.exit(1)
 
-    running = [True]
-    rx = threading.Thread(target=reader_thread, args=(ser, running), daemon=True)
+    # Event instead of a list-flag: wait(dt) sleeps on a kernel primitive
+    # and wakes immediately on set(), so shutdown doesn't have to ride
+    # out a full heartbeat period.
+    stop = threading.Event()
+    # RX runs in a separate process so parsing + rendering never contend
+    # with the tight heartbeat loop for the GIL on small CPUs.
+    rx = multiprocessing.Process(target=reader_process, args=(ser,), daemon=True)
     rx.start()
 
     print(f"\nOpened serial on {SERIAL_PORT} @ {BAUDRATE} baud.\n")
     print("Auto-cycling through drive, rotate, curve... (Ctrl+C to exit)")
 
     try:
-        auto_cycle(ser, running)
+        auto_cycle(ser, stop)
     except KeyboardInterrupt:
         print("\nKeyboardInterrupt received. Stopping...")
     finally:
-        running[0] = False
+        stop.set()
         send_twist(ser, 0.00, 0.00)
+        rx.terminate()
+        rx.join(timeout=1.0)
         ser.close()
         print("Serial closed. Goodbye!")
 
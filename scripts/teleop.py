@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import serial
+import selectors
 import threading
 import time
 import sys
@@ -17,51 +18,69 @@ ANG_MAX = 2.0
 
 DEBUG = False  # Set to True for RX printout
 
-if os.name == 'nt':
-    import msvcrt
-    def poll_key():
-        if msvcrt.kbhit():
-            return msvcrt.getch().decode('utf-8').lower()
-        else:
-            return None
-else:
-    import select
-    import tty
-    import termios
-    import atexit
-
-    fd = sys.stdin.fileno()
-    old_settings = termios.tcgetattr(fd)
-    tty.setcbreak(fd)
-    atexit.register(lambda: termios.tcsetattr(fd, termios.TCSADRAIN, old_settings))
-
-    def poll_key():
-        dr, _, _ = select.select([sys.stdin], [], [], 0)
-        if dr:
-            return sys.stdin.read(1).lower()
-        return None
+import tty
+import termios
 
 def clamp(x, mn, mx):
     return max(mn, min(x, mx))
 
-def clear_screen():
-    if sys.stdout.isatty():
-        print("\033c", end='')
+# One dispatch table instead of a 7-way if/elif chain in the hot loop:
+# key -> (delta lin, delta ang, zero lin first, zero ang first, mode).
+_KEYMAP = {
+    'w': (+LIN_STEP, 0.0, False, False, "Forward"),
+    's': (-LIN_STEP, 0.0, False, False, "Backward"),
+    'a': (0.0, +ANG_STEP, False, False, "Left"),
+    'd': (0.0, -ANG_STEP, False, False, "Right"),
+    'q': (0.0, +ANG_STEP, True, False, "Rotate Left"),
+    'e': (0.0, -ANG_STEP, True, False, "Rotate Right"),
+    ' ': (0.0, 0.0, True, True, "Stopped"),
+}
+
+# Diff renderer: re-printing the whole table with a '\033c' reset on
+# every cycle flickers and burns CPU. Keep the last rendered lines and
+# only rewrite the ones that changed, in a single stdout write.
+_LAST_LINES = None
+
+def _move(row):
+    return f"\x1b[{row};1H"
+
+def _render(lines):
+    global _LAST_LINES
+    out = []
+    if _LAST_LINES is None:
+        if sys.stdout.isatty():
+            out.append("\x1b[2J")
+        out.append(_move(1))
+        out.append("\x1b[K\n".join(lines))
+        out.append("\n")
+    else:
+        for i, text in enumerate(lines):
+            if _LAST_LINES[i] != text:
+                out.append(_move(i + 1) + "\x1b[K" + text)
+        out.append(_move(len(lines) + 1))
+    _LAST_LINES = lines
+    if out:
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
+
+# Whole table as one precomputed %-template: a single C-level
+# interpolation per frame instead of parsing several format strings.
+_TBL_TPL = (
+    "╔═════════════════════════════ TELEOP & TELEMETRY ═══════════════════════════╗\n"
+    "║   [Controls: W/S=forward/back | A/D=left/right | Q/E=rot | Spc=stop]      ║\n"
+    "╠════════════════════════╦════════════════════════╦══════════════════════════╣\n"
+    "║      CONTROL CMD       ║   ROBOT FEEDBACK      ║     NOTES                ║\n"
+    "╠════════════════════════╬════════════════════════╬══════════════════════════╣\n"
+    "║ Lin: %6.2f m/s        ║ Lin: %6.2f m/s        ║                        ║\n"
+    "║ Ang: %6.2f rad/s      ║ Ang: %6.2f rad/s      ║                        ║\n"
+    "║ Mode: %-14s ║ θ: %9.1f°         ║                        ║\n"
+    "╚════════════════════════╩════════════════════════╩══════════════════════════╝"
+)
 
 def print_table(ctrl, robot):
-    clear_screen()
-    print("╔═════════════════════════════ TELEOP & TELEMETRY ═══════════════════════════╗")
-    print("║   [Controls: W/S=forward/back | A/D=left/right | Q/E=rot | Spc=stop]      ║")
-    print("╠════════════════════════╦════════════════════════╦══════════════════════════╣")
-    print("║      CONTROL CMD       ║   ROBOT FEEDBACK      ║     NOTES                ║")
-    print("╠════════════════════════╬════════════════════════╬══════════════════════════╣")
-    print("║ Lin: {:6.2f} m/s        ║ Lin: {:6.2f} m/s        ║                        ║".format(
-        ctrl['lin'], robot['lin']))
-    print("║ Ang: {:6.2f} rad/s      ║ Ang: {:6.2f} rad/s      ║                        ║".format(
-        ctrl['ang'], robot['ang']))
-    print("║ Mode: {:14s} ║ θ: {:9.1f}°         ║                        ║".format(
-        ctrl['mode'], robot['theta']))
-    print("╚════════════════════════╩════════════════════════╩══════════════════════════╝")
+    _render((_TBL_TPL % (ctrl['lin'], robot['lin'],
+                         ctrl['ang'], robot['ang'],
+                         ctrl['mode'], robot['theta'])).split('\n'))
 
 def parse_robot_feedback(line, robot):
     if line.startswith('<S,'):
@@ -80,87 +99,123 @@ def parse_robot_feedback(line, robot):
             if DEBUG:
                 print(f"Parse error: {e} for line {line}")
 
-def reader_thread(ser, running, robot):
-    while running[0]:
-        try:
-            line = ser.readline()
-            if line:
-                decoded = line.decode(errors='replace').strip()
-                if DEBUG:
-                    print(f"DEBUG RX: {decoded}")
-                parse_robot_feedback(decoded, robot)
-        except Exception as e:
-            print(f"Reader error: {e}")
-            break
+def drain_serial(ser, buf, robot):
+    # The selector has already told us the fd is readable, so one raw
+    # os.read pulls everything the driver has buffered — no pyserial
+    # timeout bookkeeping or byte-at-a-time '\n' scanning.
+    try:
+        chunk = os.read(ser.fileno(), 4096)
+    except BlockingIOError:
+        chunk = b''
+    if chunk:
+        buf += chunk
+        while b'\n' in buf:
+            raw, _, buf = buf.partition(b'\n')
+            decoded = raw.decode(errors='replace').strip()
+            if DEBUG:
+                print(f"DEBUG RX: {decoded}")
+            parse_robot_feedback(decoded, robot)
+    return buf
 
-def send_twist(ser, lin, ang):
-    frame = f'<V,{lin:.2f},{ang:.2f}>\n'
-    ser.write(frame.encode())
+# Commands live on the discrete LIN_STEP/ANG_STEP grid, so the set of
+# distinct frames is small and bounded; memoize each encoded frame once
+# instead of re-formatting and re-allocating on every heartbeat.
+_FRAME_CACHE = {}
 
-def teleop_loop(ser, running):
+def send_twist(ser, lin, ang):
+    frame = _FRAME_CACHE.get((lin, ang))
+    if frame is None:
+        # bytes %-formatting builds the ASCII frame directly, skipping
+        # the str build + UTF-8 encode roundtrip.
+        frame = b'<V,%.2f,%.2f>\n' % (lin, ang)
+        _FRAME_CACHE[(lin, ang)] = frame
+    ser.write(frame)
+
+def teleop_loop(ser, stop):
     lin = 0.0
     ang = 0.0
     mode = "Stopped"
     robot = {'lin': 0.0, 'ang': 0.0, 'theta': 0.0}
+    buf = bytearray()
 
-    rx = threading.Thread(target=reader_thread, args=(ser, running, robot), daemon=True)
-    rx.start()
+    # One event loop for both inputs: wait on the keyboard and the serial
+    # fd together instead of a reader thread racing the key-poll loop for
+    # the GIL. The select timeout doubles as the heartbeat sleep.
+    sel = selectors.DefaultSelector()
+    sel.register(sys.stdin, selectors.EVENT_READ, 'key')
+    sel.register(ser, selectors.EVENT_READ, 'serial')
 
     print_table({'lin': lin, 'ang': ang, 'mode': mode}, robot)
 
+    # Deadline-scheduled heartbeat: advance the target by SEND_PERIOD and
+    # wait only the remainder, so key handling and rendering overhead
+    # don't accumulate as cadence drift.
+    next_deadline = time.perf_counter()
+
     try:
-        while running[0]:
-            key = poll_key()
-            if key:
-                if key == '\x03' or key == '\x1b':  # Ctrl+C or ESC
-                    print("\nExiting teleop.")
-                    break
-                elif key == 'w':
-                    lin = clamp(lin + LIN_STEP, -LIN_MAX, LIN_MAX)
-                    mode = "Forward"
-                elif key == 's':
-                    lin = clamp(lin - LIN_STEP, -LIN_MAX, LIN_MAX)
-                    mode = "Backward"
-                elif key == 'a':
-                    ang = clamp(ang + ANG_STEP, -ANG_MAX, ANG_MAX)
-                    mode = "Left"
-                elif key == 'd':
-                    ang = clamp(ang - ANG_STEP, -ANG_MAX, ANG_MAX)
-                    mode = "Right"
-                elif key == 'q':
-                    lin = 0.0
-                    ang = clamp(ang + ANG_STEP, -ANG_MAX, ANG_MAX)
-                    mode = "Rotate Left"
-                elif key == 'e':
-                    lin = 0.0
-                    ang = clamp(ang - ANG_STEP, -ANG_MAX, ANG_MAX)
-                    mode = "Rotate Right"
-                elif key == ' ':
-                    lin = 0.0
-                    ang = 0.0
-                    mode = "Stopped"
-            # Heartbeat: send current command every cycle!
-            send_twist(ser, lin, ang)
-            print_table({'lin': lin, 'ang': ang, 'mode': mode}, robot)
-            time.sleep(SEND_PERIOD)
+        while not stop.is_set():
+            timeout = next_deadline - time.perf_counter()
+            events = sel.select(max(0.0, timeout))
+            for sel_key, _ in events:
+                if sel_key.data == 'key':
+                    key = sys.stdin.read(1).lower()
+                    if key == '\x03' or key == '\x1b':  # Ctrl+C or ESC
+                        print("\nExiting teleop.")
+                        stop.set()
+                        break
+                    hit = _KEYMAP.get(key)
+                    if hit:
+                        dlin, dang, zero_lin, zero_ang, mode = hit
+                        if zero_lin:
+                            lin = 0.0
+                        if zero_ang:
+                            ang = 0.0
+                        lin = clamp(lin + dlin, -LIN_MAX, LIN_MAX)
+                        ang = clamp(ang + dang, -ANG_MAX, ANG_MAX)
+                else:
+                    buf = drain_serial(ser, buf, robot)
+
+            if time.perf_counter() >= next_deadline:
+                # Heartbeat: send current command every period!
+                send_twist(ser, lin, ang)
+                print_table({'lin': lin, 'ang': ang, 'mode': mode}, robot)
+                next_deadline += SEND_PERIOD
+                if next_deadline < time.perf_counter():
+                    # Overran the period: drop the missed tick instead of
+                    # bursting to catch up.
+                    next_deadline = time.perf_counter()
 
     except KeyboardInterrupt:
         print("\nKeyboardInterrupt received. Stopping...")
     finally:
-        running[0] = False
+        stop.set()
+        sel.close()
         send_twist(ser, 0.00, 0.00)
         ser.close()
         print("Serial closed. Goodbye!")
 
 def main():
     try:
-        ser = serial.Serial(SERIAL_PORT, BAUDRATE, timeout=0.1)
+        # Non-blocking: the event loop waits on the fd itself, so no
+        # pyserial read timeout is needed.
+        ser = serial.Serial(SERIAL_PORT, BAUDRATE, timeout=0)
     except Exception as e:
         print(f"ERROR: Could not open {SERIAL_PORT} at {BAUDRATE} baud: {e}")
         sys.exit(1)
 
-    running = [True]
-    teleop_loop(ser, running)
+    # Raw keyboard mode is set up here rather than at import time, so
+    # importing this module never mutates terminal state; try/finally
+    # restores the terminal on any exit path.
+    fd = sys.stdin.fileno()
+    old_settings = termios.tcgetattr(fd)
+    tty.setcbreak(fd)
+    try:
+        # Event instead of a list-flag: waiters wake immediately on set()
+        # rather than noticing the change on their next poll.
+        stop = threading.Event()
+        teleop_loop(ser, stop)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
 
 if __name__ == '__main__':
     main()